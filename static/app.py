@@ -1,19 +1,20 @@
 import os
 import io
-import gc
 import time
+import queue
+import tempfile
+import threading
 import numpy as np
-import matplotlib
-matplotlib.use('Agg')  # Use non-GUI backend for matplotlib
-import matplotlib.pyplot as plt
+from concurrent.futures import Future
 from datetime import datetime
-from flask import Flask, render_template, request, send_file
+from PIL import Image
+from flask import Flask, render_template, request, send_file, send_from_directory
+from flask_compress import Compress
 from tensorflow.keras.models import load_model
-from tensorflow.keras.preprocessing import image
 from reportlab.pdfgen import canvas
 from reportlab.lib.pagesizes import letter
 from reportlab.lib import colors
-from reportlab.lib.styles import getSampleStyleSheet
+from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
 from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle
 from reportlab.lib.units import inch
 from werkzeug.utils import secure_filename
@@ -32,18 +33,90 @@ if gpus:
 # Flask Setup
 # -------------------------------
 app = Flask(__name__)
+Compress(app)  # gzip text responses (HTML/CSS/JS)
 
 # Paths
 UPLOAD_FOLDER = "uploads"
 MODEL_PATH = "models/DenseNet121_glaucoma.h5"   # <-- use your saved DenseNet121 model
 app.config["UPLOAD_FOLDER"] = UPLOAD_FOLDER
+app.config['MAX_CONTENT_LENGTH'] = 16 * 1024 * 1024  # 16MB max file size
+
+# Let a front-end server (e.g. Apache mod_xsendfile) serve file bytes instead of Python
+app.use_x_sendfile = os.environ.get("USE_X_SENDFILE") == "1"
 
-# Load trained DenseNet121 model
-model = load_model(MODEL_PATH)
 IMG_SIZE = 224   # use same size as training (you used 224 for DenseNet121)
 
-# Class labels (for plotting only)
-class_labels = ["Normal", "Glaucoma"]
+# TFLite quantization mode: "float16" (default) or opt-in "int8" (dynamic-range).
+# int8 kernels are often slower than float16 on x86, so benchmark before enabling it.
+TFLITE_QUANTIZATION = os.environ.get("TFLITE_QUANTIZATION", "float16")
+if TFLITE_QUANTIZATION not in ("float16", "int8"):
+    raise ValueError(f"TFLITE_QUANTIZATION must be 'float16' or 'int8', got {TFLITE_QUANTIZATION!r}")
+
+
+# -------------------------------
+# Model Loading (TFLite)
+# -------------------------------
+def with_uint8_input(model):
+    """Wrap the model so it takes raw uint8 pixels and scales to [0, 1] in-graph"""
+    inp = tf.keras.Input((IMG_SIZE, IMG_SIZE, 3), dtype=tf.uint8)
+    # Rescaling casts uint8 itself; raw tf ops on KerasTensors fail under Keras 3
+    x = tf.keras.layers.Rescaling(1.0 / 255.0)(inp)
+    return tf.keras.Model(inp, model(x))
+
+
+def convert_to_tflite(keras_path, quantization="float16"):
+    """Convert the Keras model to a quantized TFLite FlatBuffer, cached next to the .h5"""
+    tflite_path = os.path.splitext(keras_path)[0] + f"_{quantization}_uint8in.tflite"
+
+    # Reuse the cached FlatBuffer unless the Keras model is newer
+    if os.path.exists(tflite_path) and os.path.getmtime(tflite_path) >= os.path.getmtime(keras_path):
+        return tflite_path
+
+    converter = tf.lite.TFLiteConverter.from_keras_model(with_uint8_input(load_model(keras_path)))
+    converter.optimizations = [tf.lite.Optimize.DEFAULT]
+    if quantization == "float16":
+        converter.target_spec.supported_types = [tf.float16]
+
+    # Write to a unique temp file and rename, so a crash never leaves a truncated cache
+    # and processes converting concurrently never clobber each other's writes
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(tflite_path) or ".", suffix=".tflite.tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(converter.convert())
+        os.replace(tmp_path, tflite_path)
+    except BaseException:
+        os.remove(tmp_path)
+        raise
+    print(f"Converted model to TFLite ({quantization}): {tflite_path}")
+    return tflite_path
+
+
+# Convert trained DenseNet121 model once at import; under gunicorn --preload this
+# runs in the master and workers only map the cached FlatBuffer
+TFLITE_MODEL_PATH = convert_to_tflite(MODEL_PATH, TFLITE_QUANTIZATION)
+TFLITE_NUM_THREADS = int(os.environ.get("TFLITE_NUM_THREADS", os.cpu_count()))
+
+# Micro-batching: concurrent requests are coalesced into one interpreter call
+MAX_BATCH_SIZE = 8
+# Batches are padded up to the nearest bucket; each bucket has its own interpreter
+# allocated once, so changing batch sizes never re-allocate tensors
+BATCH_BUCKETS = (1, 4, MAX_BATCH_SIZE)
+BATCH_TIMEOUT = 0.010  # seconds to wait for more requests to join a batch
+inference_queue = queue.Queue()
+PREDICT_TIMEOUT = 5  # base seconds to wait for a prediction, plus time for queued batches
+_batch_seconds = 1.0  # duration of a full MAX_BATCH_SIZE call, measured at warm-up
+
+# Leading magic bytes of the supported upload formats (WebP is checked separately)
+IMAGE_SIGNATURES = (
+    b"\xff\xd8\xff",          # JPEG
+    b"\x89PNG\r\n\x1a\n",     # PNG
+    b"GIF87a", b"GIF89a",     # GIF
+    b"BM",                    # BMP
+    b"II*\x00", b"MM\x00*",   # TIFF
+)
+
+CLEANUP_INTERVAL = 600  # seconds between background upload cleanups
+
 
 # -------------------------------
 # Cleanup Functions
@@ -52,35 +125,159 @@ def cleanup_old_files():
     """Clean up old files to prevent disk space issues"""
     try:
         upload_dir = app.config["UPLOAD_FOLDER"]
+        if not os.path.isdir(upload_dir):
+            return
         current_time = time.time()
         
-        # Remove files older than 1 hour
-        for filename in os.listdir(upload_dir):
-            filepath = os.path.join(upload_dir, filename)
-            if os.path.isfile(filepath):
-                file_age = current_time - os.path.getmtime(filepath)
-                # Delete files older than 1 hour (3600 seconds)
-                if file_age > 3600:
-                    try:
-                        os.remove(filepath)
-                        print(f"Cleaned up old file: {filename}")
-                    except OSError:
-                        pass  # File might be in use
+        # Remove files older than 1 hour; DirEntry avoids a separate isfile() stat per file
+        with os.scandir(upload_dir) as entries:
+            for entry in entries:
+                if entry.is_file():
+                    file_age = current_time - entry.stat().st_mtime
+                    # Delete files older than 1 hour (3600 seconds)
+                    if file_age > 3600:
+                        try:
+                            os.remove(entry.path)
+                            print(f"Cleaned up old file: {entry.name}")
+                        except OSError:
+                            pass  # File might be in use
     except Exception as e:
         print(f"Cleanup error: {e}")
 
 
+def _bg_cleanup():
+    """Run cleanup now and reschedule it every CLEANUP_INTERVAL seconds"""
+    cleanup_old_files()
+    timer = threading.Timer(CLEANUP_INTERVAL, _bg_cleanup)
+    timer.daemon = True
+    timer.start()
+
+
+# -------------------------------
+# Batched Inference
+# -------------------------------
+def _run_batch(img_arrays):
+    """Pad the images into the smallest fitting bucket, run its interpreter and slice the outputs"""
+    n = len(img_arrays)
+    size = next(b for b in BATCH_BUCKETS if b >= n)
+    bucket = interpreters[size]
+
+    # Rows past n keep stale pixels from an earlier batch; their outputs are discarded
+    for i, img_array in enumerate(img_arrays):
+        bucket["batch"][i] = img_array[0]
+
+    bucket["interpreter"].set_tensor(bucket["input_index"], bucket["batch"])
+    bucket["interpreter"].invoke()
+    return bucket["interpreter"].get_tensor(bucket["output_index"])[:n, 0]
+
+
+def _inference_worker():
+    """Collect up to MAX_BATCH_SIZE queued images within BATCH_TIMEOUT and predict them together"""
+    while True:
+        items = [inference_queue.get()]
+        deadline = time.monotonic() + BATCH_TIMEOUT
+        while len(items) < MAX_BATCH_SIZE:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                items.append(inference_queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+
+        try:
+            preds = _run_batch([img_array for img_array, _ in items])
+        except Exception as e:
+            for _, future in items:
+                future.set_exception(e)
+            continue
+
+        for (_, future), pred in zip(items, preds):
+            future.set_result(pred)
+
+
+# -------------------------------
+# Background Workers
+# -------------------------------
+_workers_pid = None
+_workers_lock = threading.Lock()
+
+
+# Per-process interpreters keyed by batch size, created by start_background_workers()
+interpreters = {}
+
+
+def load_interpreters():
+    """Create this process's fixed-size TFLite interpreters (one per bucket) and warm them up"""
+    global _batch_seconds
+    for size in BATCH_BUCKETS:
+        interpreter = tf.lite.Interpreter(model_path=TFLITE_MODEL_PATH, num_threads=TFLITE_NUM_THREADS)
+        input_index = interpreter.get_input_details()[0]["index"]
+        interpreter.resize_tensor_input(input_index, (size, IMG_SIZE, IMG_SIZE, 3))
+        interpreter.allocate_tensors()
+        batch = np.zeros((size, IMG_SIZE, IMG_SIZE, 3), dtype=np.uint8)
+
+        # Warm up the interpreter so one-time initialization doesn't hit the first request
+        interpreter.set_tensor(input_index, batch)
+        interpreter.invoke()
+        if size == MAX_BATCH_SIZE:
+            # Time a second, already-initialized call to size prediction timeouts
+            started = time.monotonic()
+            interpreter.invoke()
+            _batch_seconds = time.monotonic() - started
+
+        interpreters[size] = {
+            "interpreter": interpreter,
+            "input_index": input_index,
+            "output_index": interpreter.get_output_details()[0]["index"],
+            "batch": batch,
+        }
+
+
+def start_background_workers():
+    """Load the interpreters and start the inference and cleanup threads in this process.
+
+    Threads don't survive fork, so this runs once per process: eagerly from the
+    gunicorn post_fork hook or __main__, and lazily from model_predict() under any
+    other WSGI server. Safe to call more than once.
+    """
+    global _workers_pid
+    if _workers_pid == os.getpid():
+        return
+    with _workers_lock:
+        if _workers_pid == os.getpid():
+            return
+        load_interpreters()
+        # The worker thread is the only one that touches the interpreters after startup
+        threading.Thread(target=_inference_worker, name="inference-worker", daemon=True).start()
+        # Periodic cleanup runs off the request path
+        _bg_cleanup()
+        _workers_pid = os.getpid()
+
+
 # -------------------------------
 # Prediction Function
 # -------------------------------
-def model_predict(img_path, model):
+def model_predict(img):
+    start_background_workers()  # No-op once this process's workers are running
+
     try:
-        img = image.load_img(img_path, target_size=(IMG_SIZE, IMG_SIZE))
-        img_array = image.img_to_array(img) / 255.0
-        img_array = np.expand_dims(img_array, axis=0)
+        # JPEG: decode at a reduced DCT scale (no-op for other formats)
+        img.draft("RGB", (IMG_SIZE * 2, IMG_SIZE * 2))
+        # reducing_gap box-reduces large non-JPEG images before the bilinear pass
+        img = img.convert("RGB").resize((IMG_SIZE, IMG_SIZE), Image.BILINEAR, reducing_gap=2.0)
+
+        # Raw uint8 pixels; normalization to [0, 1] happens inside the model
+        img_array = np.asarray(img, dtype=np.uint8)[np.newaxis]
+
+        # Wait longer when other requests are queued ahead of this one
+        batches_ahead = inference_queue.qsize() // MAX_BATCH_SIZE + 1
+        timeout = PREDICT_TIMEOUT + batches_ahead * _batch_seconds
 
         # Use same logic as your Colab code
-        pred = model.predict(img_array)[0][0]  # Single probability value
+        future = Future()
+        inference_queue.put((img_array, future))
+        pred = float(future.result(timeout=timeout))  # Single probability value
         
         # Apply same threshold logic as Colab
         if pred > 0.5:
@@ -90,18 +287,19 @@ def model_predict(img_path, model):
             prediction = "Normal" 
             confidence = (1 - pred) * 100  # Confidence for Normal class
         
-        # Create preds array for plotting (showing both probabilities)
-        preds = np.array([1-pred, pred])  # [Normal_prob, Glaucoma_prob]
-        
-        # Clean up variables to prevent memory leaks
-        del img, img_array
-        gc.collect()
-        
-        return prediction, confidence, preds
+        return prediction, confidence
         
     except Exception as e:
         print(f"Error in model prediction: {e}")
-        return "Error", 0.0, np.array([0.5, 0.5])
+        return "Error", 0.0
+
+
+# -------------------------------
+# Upload Validation
+# -------------------------------
+def is_supported_image(head):
+    """Check the first 12 bytes of an upload against known image signatures"""
+    return head.startswith(IMAGE_SIGNATURES) or (head[:4] == b"RIFF" and head[8:12] == b"WEBP")
 
 
 # -------------------------------
@@ -119,40 +317,30 @@ def index():
             return render_template("index.html", error="No file selected")
 
         if file:
-            # Clean up old files periodically
-            cleanup_old_files()
-            
-            # Create unique filename with timestamp to avoid conflicts
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S_")
+            # Reject non-images from their magic bytes before reading the whole upload
+            head = file.stream.read(12)
+            file.stream.seek(0)
+            if not is_supported_image(head):
+                return render_template("index.html", error="Unsupported file type. Please upload a JPEG, PNG, WebP, GIF, BMP or TIFF image.")
+
+            # Create unique filename with a nanosecond timestamp to avoid same-second conflicts
+            timestamp = f"{time.time_ns()}_"
             filename = timestamp + secure_filename(file.filename)
             filepath = os.path.join(app.config["UPLOAD_FOLDER"], filename)
-            file.save(filepath)
 
             try:
-                # Prediction
-                pred_class, confidence, preds = model_predict(filepath, model)
-                
-                # Plot confidence chart with proper cleanup
-                plt.ioff()  # Turn off interactive mode
-                fig, ax = plt.subplots(figsize=(5, 4))
-                ax.bar(class_labels, preds * 100, color=["#27ae60", "#e74c3c"])
-                ax.set_title("Prediction Confidence", fontsize=14, pad=20)
-                ax.set_ylabel("Confidence (%)", fontsize=12)
-                ax.set_ylim(0, 100)
-                
-                # Add percentage labels on bars
-                for i, v in enumerate(preds * 100):
-                    ax.text(i, v + 2, f'{v:.1f}%', ha='center', va='bottom', fontweight='bold')
-                
-                plt.tight_layout()
-                plot_path = os.path.join(app.config["UPLOAD_FOLDER"], f"plot_{timestamp}.png")
-                plt.savefig(plot_path, dpi=100, bbox_inches='tight')
-                plt.close(fig)  # Close specific figure
-                plt.clf()       # Clear the figure
-                plt.cla()       # Clear the axes
+                # Decode straight from the upload; nothing touches disk before inference
+                data = file.read()
+                with Image.open(io.BytesIO(data)) as img:
+                    pred_class, confidence = model_predict(img)
+
+                # Never render a failed prediction (e.g. a timeout) as a result page
+                if pred_class == "Error":
+                    return render_template("index.html", error="Error processing image. Please try again.")
                 
-                # Force garbage collection
-                gc.collect()
+                # Persist the image only after a successful prediction; the result page shows it
+                with open(filepath, "wb") as f:
+                    f.write(data)
 
                 # Create result object for template
                 result = {
@@ -165,11 +353,6 @@ def index():
                 
             except Exception as e:
                 print(f"Error processing image: {e}")
-                # Clean up the uploaded file if processing failed
-                try:
-                    os.remove(filepath)
-                except:
-                    pass
                 return render_template("index.html", error="Error processing image. Please try again.")
 
     return render_template("index.html")
@@ -180,7 +363,103 @@ def index():
 # -------------------------------
 @app.route("/uploads/<filename>")
 def uploaded_file(filename):
-    return send_file(os.path.join(app.config["UPLOAD_FOLDER"], filename))
+    # conditional=True answers If-Modified-Since with a 304
+    response = send_from_directory(app.config["UPLOAD_FOLDER"], filename, conditional=True)
+    # Filenames carry a unique timestamp, so their content never changes; "private"
+    # keeps patients' retinal images out of shared proxy/CDN caches
+    response.headers["Cache-Control"] = "private, max-age=3600, immutable"
+    return response
+
+
+# -------------------------------
+# PDF Report Styles
+# -------------------------------
+# Built once at import time; fresh ParagraphStyles avoid mutating the sample stylesheet
+_SAMPLE_STYLES = getSampleStyleSheet()
+
+_BODY_STYLE = _SAMPLE_STYLES['BodyText']
+
+_TITLE_STYLE = ParagraphStyle(
+    'ReportTitle', parent=_SAMPLE_STYLES['Title'],
+    fontSize=24, spaceAfter=0.3*inch, textColor=colors.HexColor('#2c3e50')
+)
+
+_HEADING_STYLE = ParagraphStyle(
+    'ReportHeading', parent=_SAMPLE_STYLES['Heading2'],
+    fontSize=16, spaceAfter=0.2*inch, textColor=colors.HexColor('#34495e')
+)
+
+_DISCLAIMER_STYLE = ParagraphStyle(
+    'ReportDisclaimer', parent=_SAMPLE_STYLES['BodyText'],
+    fontSize=9, textColor=colors.HexColor('#7f8c8d'), leftIndent=20, rightIndent=20
+)
+
+_INFO_TSTYLE = TableStyle([
+    ('BACKGROUND', (0, 0), (0, -1), colors.HexColor('#ecf0f1')),
+    ('TEXTCOLOR', (0, 0), (-1, -1), colors.HexColor('#2c3e50')),
+    ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+    ('FONTNAME', (0, 0), (0, -1), 'Helvetica-Bold'),
+    ('FONTNAME', (1, 0), (1, -1), 'Helvetica'),
+    ('FONTSIZE', (0, 0), (-1, -1), 11),
+    ('ROWBACKGROUNDS', (0, 0), (-1, -1), [colors.white, colors.HexColor('#f8f9fa')]),
+    ('GRID', (0, 0), (-1, -1), 1, colors.HexColor('#bdc3c7')),
+    ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
+    ('LEFTPADDING', (0, 0), (-1, -1), 12),
+    ('RIGHTPADDING', (0, 0), (-1, -1), 12),
+    ('TOPPADDING', (0, 0), (-1, -1), 8),
+    ('BOTTOMPADDING', (0, 0), (-1, -1), 8),
+])
+
+
+def _results_table_style(result_color, confidence_color):
+    """Results table style; only the value colors differ between outcomes"""
+    return TableStyle([
+        ('BACKGROUND', (0, 0), (0, -1), colors.HexColor('#ecf0f1')),
+        ('TEXTCOLOR', (0, 0), (0, -1), colors.HexColor('#2c3e50')),
+        ('TEXTCOLOR', (1, 0), (1, 0), result_color),  # Prediction row
+        ('TEXTCOLOR', (1, 1), (1, 1), confidence_color),  # Confidence row
+        ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+        ('FONTNAME', (0, 0), (0, -1), 'Helvetica-Bold'),
+        ('FONTNAME', (1, 0), (1, -1), 'Helvetica-Bold'),
+        ('FONTSIZE', (0, 0), (-1, -1), 12),
+        ('FONTSIZE', (1, 0), (1, 0), 14),  # Make prediction larger
+        ('ROWBACKGROUNDS', (0, 0), (-1, -1), [colors.white, colors.HexColor('#f8f9fa')]),
+        ('GRID', (0, 0), (-1, -1), 1, colors.HexColor('#bdc3c7')),
+        ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
+        ('LEFTPADDING', (0, 0), (-1, -1), 12),
+        ('RIGHTPADDING', (0, 0), (-1, -1), 12),
+        ('TOPPADDING', (0, 0), (-1, -1), 10),
+        ('BOTTOMPADDING', (0, 0), (-1, -1), 10),
+    ])
+
+
+_GLAUCOMA_RESULTS_TSTYLE = _results_table_style(colors.HexColor('#e74c3c'), colors.HexColor('#c0392b'))
+_NORMAL_RESULTS_TSTYLE = _results_table_style(colors.HexColor('#27ae60'), colors.HexColor('#229954'))
+
+_REC_TSTYLE = TableStyle([
+    ('TEXTCOLOR', (0, 0), (-1, -1), colors.HexColor('#2c3e50')),
+    ('ALIGN', (0, 0), (0, -1), 'CENTER'),
+    ('ALIGN', (1, 0), (1, -1), 'LEFT'),
+    ('FONTNAME', (0, 0), (-1, -1), 'Helvetica'),
+    ('FONTSIZE', (0, 0), (-1, -1), 11),
+    ('VALIGN', (0, 0), (-1, -1), 'TOP'),
+    ('LEFTPADDING', (0, 0), (-1, -1), 8),
+    ('RIGHTPADDING', (0, 0), (-1, -1), 8),
+    ('TOPPADDING', (0, 0), (-1, -1), 6),
+    ('BOTTOMPADDING', (0, 0), (-1, -1), 6),
+])
+
+# Inference-independent report markup. Flowables are built per request because
+# ReportLab stores canvas/layout state on them, so they can't be shared between
+# concurrent builds.
+_GLAUCOMA_NOTICE = "<para fontSize='12' textColor='#e74c3c' leftIndent='20' rightIndent='20' spaceAfter='12'><b>IMPORTANT:</b> Please consult with an ophthalmologist immediately for comprehensive evaluation.</para>"
+_NORMAL_NOTICE = "<para fontSize='12' textColor='#27ae60' leftIndent='20' rightIndent='20' spaceAfter='12'><b>GOOD NEWS:</b> No signs of glaucoma detected in this analysis.</para>"
+
+_DISCLAIMER_TITLE = "<para fontSize='10' textColor='#7f8c8d'><b>IMPORTANT DISCLAIMER:</b></para>"
+
+_DISCLAIMER_MAIN = """This AI analysis is designed for screening and educational purposes only and should not replace professional medical diagnosis. The results are based on artificial intelligence analysis of retinal images and should be interpreted by qualified healthcare professionals. Please consult with a licensed ophthalmologist or optometrist for proper medical evaluation, diagnosis, and treatment recommendations."""
+
+_DISCLAIMER_PARAGRAPH = "<para fontSize='9' textColor='#7f8c8d' leftIndent='20' rightIndent='20' spaceAfter='10'>" + _DISCLAIMER_MAIN + "</para>"
 
 
 # -------------------------------
@@ -193,29 +472,15 @@ def download_report():
 
     buffer = io.BytesIO()
     doc = SimpleDocTemplate(buffer, pagesize=letter, topMargin=0.5*inch, bottomMargin=0.5*inch)
-    
-    # Get styles
-    styles = getSampleStyleSheet()
     story = []
     
-    # Custom styles
-    title_style = styles['Title']
-    title_style.fontSize = 24
-    title_style.spaceAfter = 0.3*inch
-    title_style.textColor = colors.HexColor('#2c3e50')
-    
-    heading_style = styles['Heading2']
-    heading_style.fontSize = 16
-    heading_style.textColor = colors.HexColor('#34495e')
-    heading_style.spaceAfter = 0.2*inch
-    
     # Header with logo effect
-    title = Paragraph("AI GLAUCOMA DETECTION REPORT", title_style)
-    story.append(title)
+    story.append(Paragraph("AI GLAUCOMA DETECTION REPORT", _TITLE_STYLE))
     story.append(Spacer(1, 0.2*inch))
     
     # Information Table
-    current_time = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+    now = datetime.now()
+    current_time = now.strftime('%Y-%m-%d %H:%M:%S')
     info_data = [
         ['Analysis Date:', current_time],
         ['AI Model:', 'DenseNet121 (Deep Learning)'],
@@ -223,38 +488,20 @@ def download_report():
         ['Processing Time:', '< 5 seconds']
     ]
     
-    info_table = Table(info_data, colWidths=[2*inch, 3*inch])
-    info_table.setStyle(TableStyle([
-        ('BACKGROUND', (0, 0), (0, -1), colors.HexColor('#ecf0f1')),
-        ('TEXTCOLOR', (0, 0), (-1, -1), colors.HexColor('#2c3e50')),
-        ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-        ('FONTNAME', (0, 0), (0, -1), 'Helvetica-Bold'),
-        ('FONTNAME', (1, 0), (1, -1), 'Helvetica'),
-        ('FONTSIZE', (0, 0), (-1, -1), 11),
-        ('ROWBACKGROUNDS', (0, 0), (-1, -1), [colors.white, colors.HexColor('#f8f9fa')]),
-        ('GRID', (0, 0), (-1, -1), 1, colors.HexColor('#bdc3c7')),
-        ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-        ('LEFTPADDING', (0, 0), (-1, -1), 12),
-        ('RIGHTPADDING', (0, 0), (-1, -1), 12),
-        ('TOPPADDING', (0, 0), (-1, -1), 8),
-        ('BOTTOMPADDING', (0, 0), (-1, -1), 8),
-    ]))
+    info_table = Table(info_data, colWidths=[2*inch, 3*inch], style=_INFO_TSTYLE)
     
     story.append(info_table)
     story.append(Spacer(1, 0.3*inch))
     
     # Results Section
-    results_heading = Paragraph("ANALYSIS RESULTS", heading_style)
-    story.append(results_heading)
+    story.append(Paragraph("ANALYSIS RESULTS", _HEADING_STYLE))
     
     # Determine colors and status based on prediction
     if prediction == "Glaucoma":
-        result_color = colors.HexColor('#e74c3c')
-        confidence_color = colors.HexColor('#c0392b')
+        results_style = _GLAUCOMA_RESULTS_TSTYLE
         status = "Signs of Glaucoma Detected"
     else:
-        result_color = colors.HexColor('#27ae60')
-        confidence_color = colors.HexColor('#229954')
+        results_style = _NORMAL_RESULTS_TSTYLE
         status = "No Signs of Glaucoma"
     
     # Results table
@@ -264,37 +511,17 @@ def download_report():
         ['Risk Assessment:', 'High' if prediction == 'Glaucoma' else 'Low']
     ]
     
-    results_table = Table(results_data, colWidths=[2*inch, 3*inch])
-    results_table.setStyle(TableStyle([
-        ('BACKGROUND', (0, 0), (0, -1), colors.HexColor('#ecf0f1')),
-        ('TEXTCOLOR', (0, 0), (0, -1), colors.HexColor('#2c3e50')),
-        ('TEXTCOLOR', (1, 0), (1, 0), result_color),  # Prediction row
-        ('TEXTCOLOR', (1, 1), (1, 1), confidence_color),  # Confidence row
-        ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-        ('FONTNAME', (0, 0), (0, -1), 'Helvetica-Bold'),
-        ('FONTNAME', (1, 0), (1, -1), 'Helvetica-Bold'),
-        ('FONTSIZE', (0, 0), (-1, -1), 12),
-        ('FONTSIZE', (1, 0), (1, 0), 14),  # Make prediction larger
-        ('ROWBACKGROUNDS', (0, 0), (-1, -1), [colors.white, colors.HexColor('#f8f9fa')]),
-        ('GRID', (0, 0), (-1, -1), 1, colors.HexColor('#bdc3c7')),
-        ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-        ('LEFTPADDING', (0, 0), (-1, -1), 12),
-        ('RIGHTPADDING', (0, 0), (-1, -1), 12),
-        ('TOPPADDING', (0, 0), (-1, -1), 10),
-        ('BOTTOMPADDING', (0, 0), (-1, -1), 10),
-    ]))
+    results_table = Table(results_data, colWidths=[2*inch, 3*inch], style=results_style)
     
     story.append(results_table)
     story.append(Spacer(1, 0.3*inch))
     
     # Recommendations Section
-    recommendations_heading = Paragraph("MEDICAL RECOMMENDATIONS", heading_style)
-    story.append(recommendations_heading)
+    story.append(Paragraph("MEDICAL RECOMMENDATIONS", _HEADING_STYLE))
     
     if prediction == "Glaucoma":
         # Important notice
-        important_text = "<para fontSize='12' textColor='#e74c3c' leftIndent='20' rightIndent='20' spaceAfter='12'><b>IMPORTANT:</b> Please consult with an ophthalmologist immediately for comprehensive evaluation.</para>"
-        story.append(Paragraph(important_text, styles['BodyText']))
+        story.append(Paragraph(_GLAUCOMA_NOTICE, _BODY_STYLE))
         
         # Recommendations list
         rec_data = [
@@ -306,8 +533,7 @@ def download_report():
         
     else:
         # Good news notice  
-        good_news_text = "<para fontSize='12' textColor='#27ae60' leftIndent='20' rightIndent='20' spaceAfter='12'><b>GOOD NEWS:</b> No signs of glaucoma detected in this analysis.</para>"
-        story.append(Paragraph(good_news_text, styles['BodyText']))
+        story.append(Paragraph(_NORMAL_NOTICE, _BODY_STYLE))
         
         # Recommendations list
         rec_data = [
@@ -318,60 +544,28 @@ def download_report():
         ]
     
     # Create recommendations table
-    rec_table = Table(rec_data, colWidths=[0.3*inch, 4.5*inch])
-    rec_table.setStyle(TableStyle([
-        ('TEXTCOLOR', (0, 0), (-1, -1), colors.HexColor('#2c3e50')),
-        ('ALIGN', (0, 0), (0, -1), 'CENTER'),
-        ('ALIGN', (1, 0), (1, -1), 'LEFT'),
-        ('FONTNAME', (0, 0), (-1, -1), 'Helvetica'),
-        ('FONTSIZE', (0, 0), (-1, -1), 11),
-        ('VALIGN', (0, 0), (-1, -1), 'TOP'),
-        ('LEFTPADDING', (0, 0), (-1, -1), 8),
-        ('RIGHTPADDING', (0, 0), (-1, -1), 8),
-        ('TOPPADDING', (0, 0), (-1, -1), 6),
-        ('BOTTOMPADDING', (0, 0), (-1, -1), 6),
-    ]))
+    rec_table = Table(rec_data, colWidths=[0.3*inch, 4.5*inch], style=_REC_TSTYLE)
     
     story.append(rec_table)
     story.append(Spacer(1, 0.4*inch))
     
     # Disclaimer Section
-    disclaimer_style = styles['BodyText']
-    disclaimer_style.fontSize = 9
-    disclaimer_style.textColor = colors.HexColor('#7f8c8d')
-    disclaimer_style.leftIndent = 20
-    disclaimer_style.rightIndent = 20
-    
     # Split disclaimer into multiple paragraphs for better parsing
-    disclaimer_title = "<para fontSize='10' textColor='#7f8c8d'><b>IMPORTANT DISCLAIMER:</b></para>"
-    story.append(Paragraph(disclaimer_title, disclaimer_style))
-    
-    disclaimer_main = """This AI analysis is designed for screening and educational purposes only and should not replace professional medical diagnosis. The results are based on artificial intelligence analysis of retinal images and should be interpreted by qualified healthcare professionals. Please consult with a licensed ophthalmologist or optometrist for proper medical evaluation, diagnosis, and treatment recommendations."""
-    
-    disclaimer_paragraph = "<para fontSize='9' textColor='#7f8c8d' leftIndent='20' rightIndent='20' spaceAfter='10'>" + disclaimer_main + "</para>"
-    story.append(Paragraph(disclaimer_paragraph, disclaimer_style))
+    story.append(Paragraph(_DISCLAIMER_TITLE, _DISCLAIMER_STYLE))
+    story.append(Paragraph(_DISCLAIMER_PARAGRAPH, _DISCLAIMER_STYLE))
     
     # Report info
-    report_id = datetime.now().strftime('%Y%m%d%H%M%S')
+    report_id = now.strftime('%Y%m%d%H%M%S')
     report_info = f"<para fontSize='9' textColor='#7f8c8d' leftIndent='20' rightIndent='20'><b>Report generated by:</b> DenseNet121 AI Model | <b>Report ID:</b> GLU-{report_id}</para>"
-    story.append(Paragraph(report_info, disclaimer_style))
+    story.append(Paragraph(report_info, _DISCLAIMER_STYLE))
     
     # Build PDF
     try:
         doc.build(story)
         buffer.seek(0)
         
-        # Create a copy of the buffer to avoid issues with cleanup
-        pdf_data = buffer.getvalue()
-        buffer.close()
-        
-        # Create new buffer for response
-        response_buffer = io.BytesIO(pdf_data)
-        
-        # Force garbage collection
-        gc.collect()
-        
-        return send_file(response_buffer, as_attachment=True, download_name="AI_Glaucoma_Detection_Report.pdf", mimetype="application/pdf")
+        # Werkzeug reads and closes the buffer while streaming the response
+        return send_file(buffer, as_attachment=True, download_name="AI_Glaucoma_Detection_Report.pdf", mimetype="application/pdf")
     
     except Exception as e:
         print(f"Error generating PDF: {e}")
@@ -386,8 +580,7 @@ if __name__ == "__main__":
     if not os.path.exists(UPLOAD_FOLDER):
         os.makedirs(UPLOAD_FOLDER)
     
-    # Set flask configuration for better memory management
-    app.config['MAX_CONTENT_LENGTH'] = 16 * 1024 * 1024  # 16MB max file size
+    start_background_workers()
     
     print("🚀 Starting AI Glaucoma Detection Server...")
     print("📊 Model loaded successfully")
@@ -396,7 +589,8 @@ if __name__ == "__main__":
     print("✅ Server ready at http://127.0.0.1:5000")
     
     try:
-        app.run(debug=True, threaded=True)
+        # Development server only; use gunicorn (see gunicorn.conf.py) in production
+        app.run(threaded=True)
     except KeyboardInterrupt:
         print("\n🛑 Server stopped by user")
     except Exception as e:
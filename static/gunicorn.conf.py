@@ -0,0 +1,19 @@
+# Gunicorn configuration: gunicorn -c gunicorn.conf.py wsgi:app
+import os
+
+bind = "0.0.0.0:5000"
+workers = 2
+worker_class = "gthread"
+threads = 4
+
+# Load the app (and convert the model) once in the master, then fork workers
+preload_app = True
+
+# Split CPU cores between workers so interpreters don't oversubscribe them
+os.environ.setdefault("TFLITE_NUM_THREADS", str(max(1, (os.cpu_count() or 1) // workers)))
+
+
+def post_fork(server, worker):
+    # Interpreters and background threads must be created inside each worker
+    from app import start_background_workers
+    start_background_workers()
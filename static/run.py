@@ -1,4 +1,5 @@
-from app import app
+from app import app, start_background_workers
 
 if __name__ == '__main__':
-    app.run(host='0.0.0.0', port=5000, debug=True)
\ No newline at end of file
+    start_background_workers()
+    app.run(host='0.0.0.0', port=5000)
@@ -0,0 +1,9 @@
+# WSGI entry point for production servers, e.g.:
+#   gunicorn -c gunicorn.conf.py wsgi:app
+# Under other servers (uwsgi, flask run) the model loads on the first prediction.
+from app import app
+
+if __name__ == "__main__":
+    from app import start_background_workers
+    start_background_workers()
+    app.run(threaded=True)